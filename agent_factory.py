@@ -0,0 +1,44 @@
+import functools
+from typing import Any, Dict, List
+
+from smolagents import CodeAgent
+from smolagents.models import Model
+from smolagents.tools import Tool
+
+from prompts_loader import load_prompt_templates
+from tools.final_answer import FinalAnswerTool
+
+# Shared by every agent built in this process
+final_answer = FinalAnswerTool()
+
+
+@functools.lru_cache(maxsize=4)
+def load_prompts(path: str) -> Dict[str, Any]:
+    """Returns the prompt templates at `path`, parsed at most once per process."""
+    return load_prompt_templates(path)
+
+
+def build_agent(model: Model, tools: List[Tool], prompts_path: str = "prompts.yaml", **kwargs) -> CodeAgent:
+    """Builds a CodeAgent with the settings shared by all app variants.
+
+    Args:
+        model: The model the agent should use.
+        tools: The agent's tools. The final answer tool is always added.
+        prompts_path: Path to the prompt templates YAML file.
+        **kwargs: Overrides for the default CodeAgent arguments.
+    """
+    agent_kwargs = dict(
+        max_steps=6,
+        verbosity_level=1,
+        grammar=None,
+        planning_interval=None,
+        name=None,
+        description=None,
+    )
+    agent_kwargs.update(kwargs)
+    return CodeAgent(
+        model=model,
+        tools=[final_answer, *tools],
+        prompt_templates=load_prompts(prompts_path),
+        **agent_kwargs,
+    )
@@ -1,8 +1,72 @@
-import requests
+import aiohttp
+import asyncio
+import ijson
 import json
-from typing import Dict, List, Optional, Union
+import logging
+import time
+import weakref
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Tuple, Union
 
-def get_voting_data() -> Dict[str, Union[bool, str, List[Dict]]]:
+from voting_common import (
+    PACKAGE_ID,
+    PACKAGE_TTL,
+    PACKAGE_URL,
+    VoteFieldCollector,
+    build_description_index,
+    extract_search_term,
+    json_loads,
+)
+
+logger = logging.getLogger(__name__)
+
+# asyncio primitives bind to the first event loop that uses them, so each running loop
+# gets its own request semaphore (capping requests in flight) and package cache lock
+_loop_primitives: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Tuple[asyncio.Semaphore, asyncio.Lock]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+def _get_loop_primitives() -> Tuple[asyncio.Semaphore, asyncio.Lock]:
+    loop = asyncio.get_running_loop()
+    if loop not in _loop_primitives:
+        _loop_primitives[loop] = (asyncio.Semaphore(8), asyncio.Lock())
+    return _loop_primitives[loop]
+
+# Set by get_voting_summaries so its `concurrency` replaces the default request cap for the batch
+_batch_semaphore: ContextVar[Optional[asyncio.Semaphore]] = ContextVar("_batch_semaphore", default=None)
+
+def _request_semaphore() -> asyncio.Semaphore:
+    return _batch_semaphore.get() or _get_loop_primitives()[0]
+
+def _package_lock() -> asyncio.Lock:
+    return _get_loop_primitives()[1]
+
+# Connect/read timeouts in seconds, so a hung endpoint cannot stall the whole batch
+_CLIENT_TIMEOUT = aiohttp.ClientTimeout(sock_connect=3, sock_read=15)
+
+# Package listings are cached per 5-minute bucket, keyed by (package id, bucket)
+_package_cache: Dict[tuple, Tuple[Dict, List[tuple]]] = {}
+
+async def _fetch_package(session: aiohttp.ClientSession, package_id: str = PACKAGE_ID) -> Tuple[Dict, List[tuple]]:
+    """Returns the parsed package_show response and its description index, fetching at most once per TTL bucket."""
+    key = (package_id, int(time.time() // PACKAGE_TTL))
+    # Holding the lock while fetching makes concurrent misses share a single request
+    async with _package_lock():
+        if key not in _package_cache:
+            async with _request_semaphore():
+                async with session.get(PACKAGE_URL, params={"id": package_id}) as response:
+                    response.raise_for_status()
+                    data = json_loads(await response.read())
+            if not data.get("success"):
+                # Don't cache failed listings, so the next call retries
+                return data, []
+            # Drop listings from expired buckets
+            for stale_key in [k for k in _package_cache if k[1] != key[1]]:
+                del _package_cache[stale_key]
+            _package_cache[key] = (data, build_description_index(data))
+        return _package_cache[key]
+
+async def get_voting_data(session: aiohttp.ClientSession) -> Dict[str, Union[bool, str, List[Dict]]]:
     """
     Retrieves a list of all available Swiss federal voting proposals and their metadata from opendata.swiss.
     
@@ -10,6 +74,9 @@ def get_voting_data() -> Dict[str, Union[bool, str, List[Dict]]]:
     It returns metadata about each vote, including dates, descriptions, and URLs to detailed results.
     No authentication is required to access this API.
 
+    Args:
+        session (aiohttp.ClientSession): Shared HTTP session used for the request.
+
     Returns:
         Dict[str, Union[bool, str, List[Dict]]]: A dictionary with the following structure:
             {
@@ -26,7 +93,8 @@ def get_voting_data() -> Dict[str, Union[bool, str, List[Dict]]]:
             }
 
     Example:
-        >>> result = get_voting_data()
+        >>> async with aiohttp.ClientSession() as session:
+        >>>     result = await get_voting_data(session)
         >>> if result['success']:
         >>>     # Print all available votes
         >>>     for vote in result['data']:
@@ -34,14 +102,6 @@ def get_voting_data() -> Dict[str, Union[bool, str, List[Dict]]]:
         >>> else:
         >>>     print(f"Error: {result['error']}")
     """
-    # API endpoint URL
-    url = "https://ckan.opendata.swiss/api/3/action/package_show"
-    
-    # Query parameters
-    params = {
-        "id": "echtzeitdaten-zu-den-eidgenossischen-abstimmungen-gemeindestand-am-datum-der-abstimmung"
-    }
-    
     result = {
         'success': False,
         'error': None,
@@ -49,12 +109,8 @@ def get_voting_data() -> Dict[str, Union[bool, str, List[Dict]]]:
     }
     
     try:
-        # Make the GET request
-        response = requests.get(url, params=params)
-        response.raise_for_status()
-        
-        # Parse JSON response
-        data = response.json()
+        # Fetch (or reuse the cached) package listing
+        data, _ = await _fetch_package(session)
         
         if data["success"]:
             result['success'] = True
@@ -73,7 +129,7 @@ def get_voting_data() -> Dict[str, Union[bool, str, List[Dict]]]:
         else:
             result['error'] = "API request was not successful"
             
-    except requests.exceptions.RequestException as e:
+    except aiohttp.ClientError as e:
         result['error'] = f"Error making API request: {str(e)}"
     except json.JSONDecodeError as e:
         result['error'] = f"Error parsing JSON response: {str(e)}"
@@ -82,7 +138,7 @@ def get_voting_data() -> Dict[str, Union[bool, str, List[Dict]]]:
     
     return result
 
-def get_voting_summary(proposal_name: str) -> Dict[str, Union[bool, str, Dict]]:
+async def get_voting_summary(session: aiohttp.ClientSession, proposal_name: str) -> Dict[str, Union[bool, str, Dict]]:
     """
     Retrieves and summarizes detailed results for a specific Swiss federal voting proposal.
     
@@ -91,6 +147,7 @@ def get_voting_summary(proposal_name: str) -> Dict[str, Union[bool, str, Dict]]:
     enough to match the correct vote.
 
     Args:
+        session (aiohttp.ClientSession): Shared HTTP session used for both requests.
         proposal_name (str): The name or description of the voting proposal to search for.
             Can be provided in two formats:
             1. Full format: "Federal proposals: 1. Popular Initiative 'Initiative Name'"
@@ -117,10 +174,10 @@ def get_voting_summary(proposal_name: str) -> Dict[str, Union[bool, str, Dict]]:
 
     Examples:
         >>> # Using full format
-        >>> result = get_voting_summary("Federal proposals: 1. Popular Initiative 'For a responsible economy'")
+        >>> result = await get_voting_summary(session, "Federal proposals: 1. Popular Initiative 'For a responsible economy'")
         >>> 
         >>> # Using simple format
-        >>> result = get_voting_summary("For a responsible economy")
+        >>> result = await get_voting_summary(session, "For a responsible economy")
         >>> 
         >>> if result['success']:
         >>>     summary = result['summary']
@@ -137,54 +194,40 @@ def get_voting_summary(proposal_name: str) -> Dict[str, Union[bool, str, Dict]]:
     }
     
     try:
-        # First get the list of votes
-        url = "https://ckan.opendata.swiss/api/3/action/package_show"
-        params = {
-            "id": "echtzeitdaten-zu-den-eidgenossischen-abstimmungen-gemeindestand-am-datum-der-abstimmung"
-        }
-        
-        response = requests.get(url, params=params)
-        response.raise_for_status()
-        data = response.json()
+        # First get the list of votes (shared with get_voting_data through the cache)
+        data, description_index = await _fetch_package(session)
         
         if not data["success"]:
             result['error'] = "Failed to retrieve voting data list"
             return result
             
         # Find the matching vote and its URL
-        matching_resource = None
-        # Clean up the search term - extract the main part of the initiative name
-        if "'" in proposal_name:
-            # Extract text between single quotes
-            search_term = proposal_name.split("'")[1].lower().strip()
-        else:
-            search_term = proposal_name.lower().replace("federal proposals:", "").strip()
+        # Clean up the search term - extract the text between single quotes or after the prefix
+        search_term = extract_search_term(proposal_name)
         
-        print(f"Searching for proposal containing: '{search_term}'")
-        
-        for resource in data["result"]["resources"]:
-            description = resource.get("description", {}).get("en", "").lower()
-            
-            # Print for debugging
-            print(f"\nChecking resource: {description}")
-            
-            # More precise matching - require a significant overlap
-            if search_term in description:
-                matching_resource = resource
-                print(f"Found match: {description}")
-                break
+        logger.debug("Searching for proposal containing: '%s'", search_term)
         
+        # More precise matching - require a significant overlap
+        matching_resource = next(
+            (resource for description, resource in description_index if search_term in description), None
+        )
         if not matching_resource:
             result['error'] = f"No voting data found for proposal: {proposal_name}"
             return result
             
         # Get the detailed results
         results_url = matching_resource['download_url']
-        print(f"Found matching proposal. Fetching results from: {results_url}")
+        logger.debug("Found matching proposal. Fetching results from: %s", results_url)
         
-        results_response = requests.get(results_url)
-        results_response.raise_for_status()
-        voting_results = results_response.json()
+        async with _request_semaphore():
+            async with session.get(results_url) as results_response:
+                results_response.raise_for_status()
+                # Stream-parse the (multi-MB) document, stopping once the national result is read
+                collector = VoteFieldCollector()
+                async for prefix, event, value in ijson.parse_async(results_response.content, use_float=True):
+                    if collector.feed(prefix, event, value):
+                        break
+                voting_results = collector.result()
         
         # Extract the summary from the new JSON structure
         if 'schweiz' in voting_results and 'vorlagen' in voting_results['schweiz']:
@@ -209,51 +252,103 @@ def get_voting_summary(proposal_name: str) -> Dict[str, Union[bool, str, Dict]]:
         else:
             result['error'] = "Could not find voting results in the data"
             
-    except requests.exceptions.RequestException as e:
+    except aiohttp.ClientError as e:
         result['error'] = f"Error making API request: {str(e)}"
-    except json.JSONDecodeError as e:
+    except (json.JSONDecodeError, ijson.JSONError) as e:
         result['error'] = f"Error parsing JSON response: {str(e)}"
     except Exception as e:
         result['error'] = f"An unexpected error occurred: {str(e)}"
     
     return result
 
-if __name__ == "__main__":
-    # Example usage with formatted output
-    result = get_voting_data()
-    if result['success']:
-        print("Available voting data:")
-        print("-" * 50)
-        for resource in result['data']:
-            print(f"Date: {resource['date']}")
-            print(f"Description: {resource['description']}")
-            print(f"Download URL: {resource['download_url']}")
-            print(f"Format: {resource['format']}")
-            print(f"Last Modified: {resource['last_modified']}")
+async def get_voting_summaries(
+    proposal_names: List[str],
+    concurrency: int = 8,
+    session: Optional[aiohttp.ClientSession] = None,
+) -> List[Union[Dict[str, Union[bool, str, Dict]], BaseException]]:
+    """
+    Retrieves summaries for several voting proposals concurrently.
+
+    The package listing is fetched once and shared by every lookup, then the detailed
+    result downloads run in parallel. Within the batch, at most `concurrency` requests are
+    in flight at a time; this replaces the default cap used by single calls.
+
+    Args:
+        proposal_names (List[str]): Proposal names, in any format accepted by get_voting_summary.
+        concurrency (int): Maximum number of requests in flight at once.
+        session (aiohttp.ClientSession, optional): Session to reuse. When omitted, a session
+            with a per-host connection limit of `concurrency` is created for the batch.
+
+    Returns:
+        List: One get_voting_summary result per name, in the same order. An exception is
+            returned in place of a result if a lookup raised unexpectedly.
+
+    Example:
+        >>> results = await get_voting_summaries(["For a responsible economy", "Biodiversity"])
+        >>> for result in results:
+        >>>     print(result['summary']['title'] if result['success'] else result['error'])
+    """
+    if session is None:
+        connector = aiohttp.TCPConnector(limit_per_host=concurrency)
+        async with aiohttp.ClientSession(connector=connector, timeout=_CLIENT_TIMEOUT) as own_session:
+            return await get_voting_summaries(proposal_names, concurrency, own_session)
+
+    # The listing cache coalesces concurrent misses, so all lookups share one package_show request.
+    # gather() copies the current context into each task, so every lookup sees the batch semaphore.
+    token = _batch_semaphore.set(asyncio.Semaphore(concurrency))
+    try:
+        return await asyncio.gather(
+            *[get_voting_summary(session, name) for name in proposal_names], return_exceptions=True
+        )
+    finally:
+        _batch_semaphore.reset(token)
+
+async def main():
+    # One shared session so every request reuses the same connection pool
+    async with aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=20), timeout=_CLIENT_TIMEOUT) as session:
+        # Example usage with formatted output
+        result = await get_voting_data(session)
+        if result['success']:
+            print("Available voting data:")
             print("-" * 50)
-    else:
-        print(f"Error: {result['error']}")
+            for resource in result['data']:
+                print(f"Date: {resource['date']}")
+                print(f"Description: {resource['description']}")
+                print(f"Download URL: {resource['download_url']}")
+                print(f"Format: {resource['format']}")
+                print(f"Last Modified: {resource['last_modified']}")
+                print("-" * 50)
+        else:
+            print(f"Error: {result['error']}")
 
-    # Example usage
-    proposal = "Federal proposals: 1. Popular Initiative 'For a responsible economy within our planet's limits'"
-    result = get_voting_summary(proposal)
-    
-    if result['success']:
-        summary = result['summary']
-        print("\nVoting Summary:")
-        print("-" * 50)
-        print(f"Title (English): {summary['title']}")
-        print(f"Date: {summary['date'][:4]}-{summary['date'][4:6]}-{summary['date'][6:]}")  # Format YYYY-MM-DD
-        print(f"Result: {'Accepted' if summary['accepted'] else 'Rejected'}")
-        print(f"Turnout: {summary['turnout']:.1f}%")
-        print(f"Yes Percentage: {summary['yes_percentage']:.1f}%")
-        print(f"Yes Votes: {summary['yes_votes']:,}")
-        print(f"No Votes: {summary['no_votes']:,}")
-        print(f"Eligible Voters: {summary['eligible_voters']:,}")
-        
-        # Print titles in all languages
-        print("\nTitles in all languages:")
-        for lang, title in summary['all_titles'].items():
-            print(f"{lang.upper()}: {title}")
-    else:
-        print(f"Error: {result['error']}")
+        # Example usage - summaries for several proposals are fetched concurrently
+        proposals = [
+            "Federal proposals: 1. Popular Initiative 'For a responsible economy within our planet's limits'",
+        ]
+        results = await get_voting_summaries(proposals, session=session)
+
+    for result in results:
+        if isinstance(result, BaseException):
+            print(f"Error: {result}")
+        elif result['success']:
+            summary = result['summary']
+            print("\nVoting Summary:")
+            print("-" * 50)
+            print(f"Title (English): {summary['title']}")
+            print(f"Date: {summary['date'][:4]}-{summary['date'][4:6]}-{summary['date'][6:]}")  # Format YYYY-MM-DD
+            print(f"Result: {'Accepted' if summary['accepted'] else 'Rejected'}")
+            print(f"Turnout: {summary['turnout']:.1f}%")
+            print(f"Yes Percentage: {summary['yes_percentage']:.1f}%")
+            print(f"Yes Votes: {summary['yes_votes']:,}")
+            print(f"No Votes: {summary['no_votes']:,}")
+            print(f"Eligible Voters: {summary['eligible_voters']:,}")
+            
+            # Print titles in all languages
+            print("\nTitles in all languages:")
+            for lang, title in summary['all_titles'].items():
+                print(f"{lang.upper()}: {title}")
+        else:
+            print(f"Error: {result['error']}")
+
+if __name__ == "__main__":
+    asyncio.run(main())
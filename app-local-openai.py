@@ -1,16 +1,71 @@
-from smolagents import CodeAgent, OpenAIServerModel, tool
+from smolagents import OpenAIServerModel, tool
 import dotenv
+import functools
+import ijson
 import os
+import time
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
-from typing import Dict, List, Optional, Union
-import yaml
-from tools.final_answer import FinalAnswerTool
+import logging
+from typing import Dict, List, Optional, Tuple, Union
+from agent_factory import build_agent
+from voting_common import (
+    PACKAGE_ID,
+    PACKAGE_TTL,
+    PACKAGE_URL,
+    VoteFieldCollector,
+    build_description_index,
+    extract_search_term,
+    json_loads,
+)
 from Gradio_UI import GradioUI
 
+logger = logging.getLogger(__name__)
+
 dotenv.load_dotenv()
 api_key = os.getenv("OPENAI_API_KEY")
 
+# Shared session so repeated tool calls reuse pooled keep-alive connections; transient
+# failures are retried with backoff instead of surfacing to the agent
+_RETRY = Retry(
+    total=3,
+    backoff_factor=0.3,
+    status_forcelist=(429, 500, 502, 503, 504),
+    allowed_methods=("GET",),
+)
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=_RETRY))
+
+# (connect, read) timeout in seconds, so a hung endpoint cannot stall a tool call indefinitely
+_REQUEST_TIMEOUT = (3.05, 15)
+
+class _UnsuccessfulListing(Exception):
+    """Carries a {"success": false} listing out of _fetch_package, since lru_cache does not cache exceptions."""
+
+    def __init__(self, data: Dict):
+        super().__init__("package_show was not successful")
+        self.data = data
+
+# Package listings are cached per PACKAGE_TTL bucket
+@functools.lru_cache(maxsize=8)
+def _fetch_package(package_id: str, epoch_bucket: int) -> Tuple[Dict, List[tuple]]:
+    """Returns the parsed package_show response and its description index; epoch_bucket only serves as the cache expiry key."""
+    response = _SESSION.get(PACKAGE_URL, params={"id": package_id}, timeout=_REQUEST_TIMEOUT)
+    response.raise_for_status()
+    data = json_loads(response.content)
+    if not data.get("success"):
+        raise _UnsuccessfulListing(data)
+    return data, build_description_index(data)
+
+def _get_package(package_id: str = PACKAGE_ID) -> Tuple[Dict, List[tuple]]:
+    """Returns the cached listing; unsuccessful listings are returned uncached so the next call retries."""
+    try:
+        return _fetch_package(package_id, int(time.time() // PACKAGE_TTL))
+    except _UnsuccessfulListing as e:
+        return e.data, []
+
 # Tool to retrieve stock price from Yahoo Finance
 
 @tool
@@ -46,14 +101,6 @@ def get_voting_data() -> Dict[str, Union[bool, str, List[Dict]]]:
         >>> else:
         >>>     print(f"Error: {result['error']}")
     """
-    # API endpoint URL
-    url = "https://ckan.opendata.swiss/api/3/action/package_show"
-    
-    # Query parameters
-    params = {
-        "id": "echtzeitdaten-zu-den-eidgenossischen-abstimmungen-gemeindestand-am-datum-der-abstimmung"
-    }
-    
     result = {
         'success': False,
         'error': None,
@@ -61,12 +108,8 @@ def get_voting_data() -> Dict[str, Union[bool, str, List[Dict]]]:
     }
     
     try:
-        # Make the GET request
-        response = requests.get(url, params=params)
-        response.raise_for_status()
-        
-        # Parse JSON response
-        data = response.json()
+        # Fetch (or reuse the cached) package listing
+        data, _ = _get_package()
         
         if data["success"]:
             result['success'] = True
@@ -151,54 +194,40 @@ def get_voting_summary(proposal_name: str) -> Dict[str, Union[bool, str, Dict]]:
     }
     
     try:
-        # First get the list of votes
-        url = "https://ckan.opendata.swiss/api/3/action/package_show"
-        params = {
-            "id": "echtzeitdaten-zu-den-eidgenossischen-abstimmungen-gemeindestand-am-datum-der-abstimmung"
-        }
-        
-        response = requests.get(url, params=params)
-        response.raise_for_status()
-        data = response.json()
+        # First get the list of votes (shared with get_voting_data through the cache)
+        data, description_index = _get_package()
         
         if not data["success"]:
             result['error'] = "Failed to retrieve voting data list"
             return result
             
         # Find the matching vote and its URL
-        matching_resource = None
-        # Clean up the search term - extract the main part of the initiative name
-        if "'" in proposal_name:
-            # Extract text between single quotes
-            search_term = proposal_name.split("'")[1].lower().strip()
-        else:
-            search_term = proposal_name.lower().replace("federal proposals:", "").strip()
+        # Clean up the search term - extract the text between single quotes or after the prefix
+        search_term = extract_search_term(proposal_name)
         
-        print(f"Searching for proposal containing: '{search_term}'")
-        
-        for resource in data["result"]["resources"]:
-            description = resource.get("description", {}).get("en", "").lower()
-            
-            # Print for debugging
-            print(f"\nChecking resource: {description}")
-            
-            # More precise matching - require a significant overlap
-            if search_term in description:
-                matching_resource = resource
-                print(f"Found match: {description}")
-                break
+        logger.debug("Searching for proposal containing: '%s'", search_term)
         
+        # More precise matching - require a significant overlap
+        matching_resource = next(
+            (resource for description, resource in description_index if search_term in description), None
+        )
         if not matching_resource:
             result['error'] = f"No voting data found for proposal: {proposal_name}"
             return result
             
         # Get the detailed results
         results_url = matching_resource['download_url']
-        print(f"Found matching proposal. Fetching results from: {results_url}")
+        logger.debug("Found matching proposal. Fetching results from: %s", results_url)
         
-        results_response = requests.get(results_url)
-        results_response.raise_for_status()
-        voting_results = results_response.json()
+        with _SESSION.get(results_url, stream=True, timeout=_REQUEST_TIMEOUT) as results_response:
+            results_response.raise_for_status()
+            results_response.raw.decode_content = True
+            # Stream-parse the (multi-MB) document, stopping once the national result is read
+            collector = VoteFieldCollector()
+            for prefix, event, value in ijson.parse(results_response.raw, use_float=True):
+                if collector.feed(prefix, event, value):
+                    break
+            voting_results = collector.result()
         
         # Extract the summary from the new JSON structure
         if 'schweiz' in voting_results and 'vorlagen' in voting_results['schweiz']:
@@ -225,7 +254,7 @@ def get_voting_summary(proposal_name: str) -> Dict[str, Union[bool, str, Dict]]:
             
     except requests.exceptions.RequestException as e:
         result['error'] = f"Error making API request: {str(e)}"
-    except json.JSONDecodeError as e:
+    except (json.JSONDecodeError, ijson.JSONError) as e:
         result['error'] = f"Error parsing JSON response: {str(e)}"
     except Exception as e:
         result['error'] = f"An unexpected error occurred: {str(e)}"
@@ -233,7 +262,6 @@ def get_voting_summary(proposal_name: str) -> Dict[str, Union[bool, str, Dict]]:
     return result
 
 
-final_answer = FinalAnswerTool()
 model = OpenAIServerModel(
     max_tokens=2096,
     temperature=0.5,
@@ -245,19 +273,6 @@ model = OpenAIServerModel(
 # Import tool from Hub
 # image_generation_tool = load_tool("agents-course/text-to-image", trust_remote_code=True)
 
-with open("prompts-openai.yaml", 'r') as stream:
-    prompt_templates = yaml.safe_load(stream)
-    
-agent = CodeAgent(
-    model=model,
-    tools=[final_answer, get_voting_data, get_voting_summary], ## add your tools here (don't remove final answer)
-    max_steps=6,
-    verbosity_level=1,
-    grammar=None,
-    planning_interval=None,
-    name=None,
-    description=None,
-    prompt_templates=prompt_templates
-)
+agent = build_agent(model, [get_voting_data, get_voting_summary], prompts_path="prompts-openai.yaml") ## add your tools here (final answer is added automatically)
 
 GradioUI(agent).launch()
\ No newline at end of file
@@ -0,0 +1,57 @@
+import glob
+import os
+import pickle
+import tempfile
+from typing import Any, Dict
+
+import yaml
+
+# Use the libyaml-backed loader when PyYAML was built with it
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+def load_prompt_templates(path: str) -> Dict[str, Any]:
+    """Loads prompt templates from a YAML file, reusing a pickled copy while the file is unchanged.
+
+    The parsed templates are pickled next to the YAML file as `<path>.<mtime>.pkl`, so editing
+    the YAML file invalidates the cache automatically.
+
+    Args:
+        path: Path to the prompt templates YAML file (e.g. "prompts.yaml").
+    """
+    mtime = os.path.getmtime(path)
+    cache_path = f"{path}.{mtime}.pkl"
+
+    try:
+        with open(cache_path, "rb") as f:
+            return pickle.load(f)
+    except Exception:
+        # Missing or unreadable cache (unpickling can raise almost anything); reparse the YAML
+        pass
+
+    with open(path, "r") as stream:
+        prompt_templates = yaml.load(stream, Loader=_YAML_LOADER)
+
+    try:
+        # Remove caches left behind by earlier versions of the file
+        for stale_path in glob.glob(f"{glob.escape(path)}.*.pkl"):
+            if stale_path != cache_path:
+                try:
+                    os.remove(stale_path)
+                except FileNotFoundError:
+                    # Another process already removed it
+                    pass
+        # Write to a temp file and rename it into place, so concurrent readers never see a partial pickle
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(cache_path) or ".", suffix=".pkl")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(prompt_templates, f)
+            os.replace(tmp_path, cache_path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+    except OSError:
+        # Caching is best effort, e.g. on a read-only filesystem
+        pass
+
+    return prompt_templates
@@ -0,0 +1,107 @@
+import datetime
+import threading
+from typing import List, Tuple
+from zoneinfo import ZoneInfo
+
+import pandas as pd
+import yfinance as yf
+from cachetools import TTLCache
+from smolagents import tool
+
+# Formatted quotes are cached briefly while the market is open and for an hour once it has closed
+_OPEN_PRICE_CACHE = TTLCache(maxsize=256, ttl=15)
+_CLOSED_PRICE_CACHE = TTLCache(maxsize=256, ttl=3600)
+_PRICE_CACHE_LOCK = threading.Lock()
+
+_NY = ZoneInfo("America/New_York")
+# (date, market open, market close) for the current New York trading day
+_TODAY_BOUNDS = (None, None, None)
+
+
+def _market_bounds(now: datetime.datetime) -> Tuple[datetime.datetime, datetime.datetime]:
+    global _TODAY_BOUNDS
+    bounds = _TODAY_BOUNDS
+    if bounds[0] != now.date():
+        bounds = (
+            now.date(),
+            now.replace(hour=9, minute=30, second=0, microsecond=0),
+            now.replace(hour=16, minute=0, second=0, microsecond=0),
+        )
+        _TODAY_BOUNDS = bounds
+    return bounds[1], bounds[2]
+
+
+# Tool to retrieve stock price from Yahoo Finance
+@tool
+def get_stock_price(ticker: str) -> str:
+    """A tool that fetches the latest stock price for a given ticker symbol from Yahoo Finance.
+
+    Args:
+        ticker: A string representing the stock ticker symbol (e.g., "AAPL" for Apple).
+    """
+
+    try:
+        # Get the current time in New York (EST/EDT)
+        current_time = datetime.datetime.now(_NY)
+
+        # Market open and close times, computed once per day
+        market_open, market_close = _market_bounds(current_time)
+
+        # Check if the market is open; this decides how long the quote stays cached
+        is_open = market_open <= current_time <= market_close
+
+        cache = _OPEN_PRICE_CACHE if is_open else _CLOSED_PRICE_CACHE
+        cache_key = (ticker.upper(), is_open)
+        with _PRICE_CACHE_LOCK:
+            if cache_key in cache:
+                return cache[cache_key]
+
+        # The chart metadata carries both the currency and the latest quote: the live price
+        # while the market is open, the last close once it has closed
+        metadata = yf.Ticker(ticker).get_history_metadata()
+        currency = metadata.get("currency", "USD")
+        price = metadata.get("regularMarketPrice")
+
+        if price is None:
+            return "Price unavailable"
+
+        formatted_price = f"{currency} {price:,.2f}"
+        with _PRICE_CACHE_LOCK:
+            cache[cache_key] = formatted_price
+        return formatted_price
+
+    except Exception as e:
+        return f"Error fetching price: {e}"
+
+
+@tool
+def get_stock_prices(tickers: List[str]) -> str:
+    """A tool that fetches the latest stock prices for several ticker symbols at once from Yahoo Finance.
+    Prefer this over calling get_stock_price repeatedly when more than one price is needed.
+    Prices are in each ticker's trading currency, which is not included in the output;
+    use get_stock_price when the currency matters.
+
+    Args:
+        tickers: A list of stock ticker symbols (e.g., ["AAPL", "MSFT", "NVDA"]).
+    """
+
+    try:
+        # A single batched download instead of one request per ticker
+        data = yf.download(" ".join(tickers), period="1d", progress=False, threads=True, timeout=15)
+        closes = data["Close"]
+        if isinstance(closes, pd.Series):
+            closes = closes.to_frame(name=tickers[0].upper())
+
+        lines = []
+        for ticker in tickers:
+            symbol = ticker.upper()
+            series = closes[symbol].dropna() if symbol in closes.columns else None
+            if series is None or series.empty:
+                lines.append(f"{symbol}: Price unavailable")
+            else:
+                lines.append(f"{symbol}: {series.iloc[-1]:,.2f}")
+
+        return "\n".join(lines)
+
+    except Exception as e:
+        return f"Error fetching prices: {e}"
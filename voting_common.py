@@ -0,0 +1,82 @@
+import json
+import re
+from typing import Dict, List
+
+import ijson
+
+# orjson parses the large result payloads much faster; fall back to the stdlib if it is missing
+try:
+    import orjson
+    json_loads = orjson.loads
+except ImportError:
+    json_loads = json.loads
+
+# CKAN package listing all federal voting result resources
+PACKAGE_URL = "https://ckan.opendata.swiss/api/3/action/package_show"
+PACKAGE_ID = "echtzeitdaten-zu-den-eidgenossischen-abstimmungen-gemeindestand-am-datum-der-abstimmung"
+
+# Package listings are cached per 5-minute bucket
+PACKAGE_TTL = 300
+
+# Extracts the initiative name from "Federal proposals: 1. Popular Initiative 'Name'" style input
+_QUOTED_NAME_RE = re.compile(r"'([^']*)")
+_PREFIX_RE = re.compile(r"federal proposals:", re.IGNORECASE)
+
+
+def extract_search_term(proposal_name: str) -> str:
+    """Returns the lowercased text after the first single quote, or the name with any "Federal proposals:" removed."""
+    match = _QUOTED_NAME_RE.search(proposal_name)
+    if match:
+        return match.group(1).lower().strip()
+    return _PREFIX_RE.sub("", proposal_name).lower().strip()
+
+
+def build_description_index(data: Dict) -> List[tuple]:
+    """Pairs each resource with its lowercased English description for substring lookups."""
+    if not data.get("success"):
+        return []
+    return [(resource.get("description", {}).get("en", "").lower(), resource)
+            for resource in data["result"]["resources"]]
+
+
+class VoteFieldCollector:
+    """Rebuilds only the parts of a results document used by the summary from ijson parser events.
+
+    The per-canton and per-commune results are skipped, so the full nationwide tree is never
+    materialized.
+    """
+
+    FIELDS = (
+        "abstimmtag",
+        "schweiz.vorlagen.item.vorlageAngenommen",
+        "schweiz.vorlagen.item.resultat",
+        "schweiz.vorlagen.item.vorlagenTitel",
+    )
+
+    def __init__(self):
+        self._builders: Dict[str, "ijson.ObjectBuilder"] = {}
+        self._first_vote_done = False
+
+    def feed(self, prefix: str, event: str, value) -> bool:
+        """Consumes one parser event; returns True once every needed field has been read."""
+        if prefix == "schweiz.vorlagen.item" and event == "end_map":
+            self._first_vote_done = True
+        elif not (self._first_vote_done and prefix.startswith("schweiz.vorlagen")):
+            for field in self.FIELDS:
+                if prefix == field or prefix.startswith(field + "."):
+                    self._builders.setdefault(field, ijson.ObjectBuilder()).event(event, value)
+                    break
+        return self._first_vote_done and "abstimmtag" in self._builders
+
+    def result(self) -> Dict:
+        """Returns the collected fields in the layout of the original results document."""
+        voting_results = {}
+        vote_info = {}
+        for field, builder in self._builders.items():
+            if field == "abstimmtag":
+                voting_results[field] = builder.value
+            else:
+                vote_info[field.rsplit(".", 1)[1]] = builder.value
+        if vote_info:
+            voting_results["schweiz"] = {"vorlagen": [vote_info]}
+        return voting_results